@@ -0,0 +1,251 @@
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import datetime
+import pathlib
+import urllib.error
+import urllib.request
+from typing import List, Optional
+
+API = "https://discord.com/api/v10"
+DISCORD_EPOCH_MS = 1420070400000
+# Discord rejects bulk-delete for messages older than 14 days; keep a margin
+# so a message doesn't age past the cutoff between selection and deletion.
+BULK_MAX_AGE = datetime.timedelta(days=14) - datetime.timedelta(minutes=10)
+BULK_MAX_IDS = 100
+PAGE_SIZE = 100
+
+
+def load_env(paths=None):
+    base = pathlib.Path(__file__).resolve().parent.parent / "config"
+    defaults = [base / ".env", base / ".env.codex", base / ".env.template"]
+    to_load = [str(p) for p in (paths or defaults)]
+    env = {}
+    for p in to_load:
+        if os.path.exists(p):
+            with open(p, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith("#"):
+                        continue
+                    if "=" in line:
+                        k, v = line.split("=", 1)
+                        env[k.strip()] = v.strip().strip('"').strip("'")
+    os.environ.update(env)
+    return env
+
+
+def _discord_request(method: str, url: str, token: str, data: Optional[dict] = None, retries: int = 5):
+    """Send a request, sleeping through 429s and exhausted rate-limit buckets."""
+    headers = {"Authorization": f"Bot {token}"}
+    body = None
+    if data is not None:
+        headers["Content-Type"] = "application/json"
+        body = json.dumps(data).encode("utf-8")
+    for attempt in range(retries + 1):
+        req = urllib.request.Request(url, headers=headers, method=method, data=body)
+        try:
+            with urllib.request.urlopen(req) as resp:
+                raw = resp.read()
+                if resp.headers.get("X-RateLimit-Remaining") == "0":
+                    time.sleep(float(resp.headers.get("X-RateLimit-Reset-After") or 1))
+        except urllib.error.HTTPError as e:
+            if e.code != 429 or attempt == retries:
+                raise
+            try:
+                wait = float(json.loads(e.read().decode("utf-8")).get("retry_after", 1))
+            except Exception:
+                wait = float(e.headers.get("Retry-After") or 1)
+            print(f"[rate-limit] {method} {url} retry in {wait:.2f}s", file=sys.stderr)
+            time.sleep(wait)
+            continue
+        if not raw:
+            return None
+        try:
+            return json.loads(raw.decode("utf-8"))
+        except Exception:
+            return raw.decode("utf-8", errors="replace")
+
+
+def snowflake_time(message_id: str) -> datetime.datetime:
+    ms = (int(message_id) >> 22) + DISCORD_EPOCH_MS
+    return datetime.datetime.fromtimestamp(ms / 1000, tz=datetime.timezone.utc)
+
+
+def parse_age(text: str) -> datetime.timedelta:
+    m = re.fullmatch(r"(\d+)([smhdw])", text.strip())
+    if not m:
+        raise argparse.ArgumentTypeError(f"invalid age {text!r} (use e.g. 30m, 12h, 7d, 2w)")
+    unit = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}[m.group(2)]
+    return datetime.timedelta(**{unit: int(m.group(1))})
+
+
+def get_messages(token: str, channel_id: str, before: Optional[str] = None, limit: int = PAGE_SIZE):
+    url = f"{API}/channels/{channel_id}/messages?limit={limit}"
+    if before:
+        url += f"&before={before}"
+    return _discord_request("GET", url, token)
+
+
+def bulk_delete(token: str, channel_id: str, ids: List[str]):
+    return _discord_request(
+        "POST",
+        f"{API}/channels/{channel_id}/messages/bulk-delete",
+        token,
+        {"messages": ids},
+    )
+
+
+def delete_message(token: str, channel_id: str, message_id: str):
+    return _discord_request("DELETE", f"{API}/channels/{channel_id}/messages/{message_id}", token)
+
+
+def load_state(path: Optional[str]) -> dict:
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_state(path: Optional[str], state: dict):
+    if not path:
+        return
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+
+def matches(m: dict, args, cutoff: Optional[datetime.datetime]) -> bool:
+    author = m.get("author") or {}
+    if args.author and not {author.get("id"), author.get("username")} & set(args.author):
+        return False
+    if args.bots_only and not author.get("bot"):
+        return False
+    if cutoff and snowflake_time(m["id"]) > cutoff:
+        return False
+    if args.match and not args.match.search(m.get("content") or ""):
+        return False
+    return True
+
+
+def delete_selected(token: str, channel_id: str, ids: List[str], delay: float) -> int:
+    """Bulk-delete recent ids in batches of 100; delete older ones one at a time."""
+    bulk_cutoff = datetime.datetime.now(datetime.timezone.utc) - BULK_MAX_AGE
+    recent = [i for i in ids if snowflake_time(i) > bulk_cutoff]
+    old = [i for i in ids if snowflake_time(i) <= bulk_cutoff]
+    # bulk-delete requires at least two ids, so a lone leftover goes single.
+    if len(recent) % BULK_MAX_IDS == 1:
+        old.insert(0, recent.pop())
+    deleted = 0
+    for start in range(0, len(recent), BULK_MAX_IDS):
+        batch = recent[start:start + BULK_MAX_IDS]
+        bulk_delete(token, channel_id, batch)
+        deleted += len(batch)
+    for message_id in old:
+        try:
+            delete_message(token, channel_id, message_id)
+            deleted += 1
+        except urllib.error.HTTPError as e:
+            if e.code != 404:
+                raise
+        time.sleep(delay)
+    return deleted
+
+
+def clean_channel(token: str, channel_id: str, args, state: dict) -> int:
+    cutoff = (
+        datetime.datetime.now(datetime.timezone.utc) - args.older_than
+        if args.older_than
+        else None
+    )
+    chan_state = state.setdefault(channel_id, {})
+    if chan_state.get("done"):
+        print(f"[skip] {channel_id}: already completed (remove state file to rescan)")
+        return 0
+    before = chan_state.get("before")
+    total = chan_state.get("deleted", 0)
+    while args.max is None or total < args.max:
+        page = get_messages(token, channel_id, before)
+        if not isinstance(page, list):
+            raise RuntimeError(f"unexpected response for channel {channel_id}: {page}")
+        if not page:
+            chan_state["done"] = True
+            break
+        selected = [m for m in page if matches(m, args, cutoff)]
+        if args.max is not None:
+            selected = selected[: args.max - total]
+        for m in selected:
+            if args.dry_run or args.verbose:
+                ts = (m.get("timestamp") or "")[:16]
+                author = (m.get("author") or {}).get("username", "?")
+                content = (m.get("content") or "[no content]").replace("\n", " ")[:80]
+                print(f"{'[dry-run] ' if args.dry_run else ''}{channel_id} [{ts}] {author}: {content}")
+        if selected and not args.dry_run:
+            total += delete_selected(token, channel_id, [m["id"] for m in selected], args.delay)
+        elif args.dry_run:
+            total += len(selected)
+        # Discord returns newest first, so the last id is the oldest scanned.
+        before = page[-1]["id"]
+        chan_state.update(before=before, deleted=total)
+        if not args.dry_run:
+            save_state(args.state, state)
+        if len(page) < PAGE_SIZE:
+            chan_state["done"] = True
+            break
+    if not args.dry_run:
+        save_state(args.state, state)
+    return total
+
+
+def main(argv: List[str]):
+    parser = argparse.ArgumentParser(
+        description="Bulk-delete messages from Discord channels, honoring rate limits."
+    )
+    parser.add_argument("-e", "--env", help="env file to load instead of discord/config defaults")
+    parser.add_argument(
+        "-c", "--channel", action="append",
+        help="channel id (repeatable; default DISCORD_AGENT_STATUS_CHANNEL)",
+    )
+    parser.add_argument("-a", "--author", action="append", help="author id or username (repeatable)")
+    parser.add_argument("--bots-only", action="store_true", help="only messages posted by bots")
+    parser.add_argument("--older-than", type=parse_age, help="only messages older than e.g. 12h, 7d, 2w")
+    parser.add_argument("-m", "--match", type=re.compile, help="regex the message content must match")
+    parser.add_argument("--max", type=int, help="stop after this many deletions per channel")
+    parser.add_argument("--delay", type=float, default=1.0, help="seconds between single deletes (default 1.0)")
+    parser.add_argument("--state", help="JSON file to record progress in and resume from")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="list matching messages without deleting")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print each message as it is deleted")
+    args = parser.parse_args(argv)
+
+    load_env((args.env,) if args.env else None)
+    token = os.environ.get("DISCORD_BOT_TOKEN")
+    channels = args.channel or [
+        c for c in (os.environ.get("DISCORD_AGENT_STATUS_CHANNEL"),) if c
+    ]
+    if not token:
+        print("Missing DISCORD_BOT_TOKEN in env", file=sys.stderr)
+        sys.exit(2)
+    if not channels:
+        print("No channel given and DISCORD_AGENT_STATUS_CHANNEL unset", file=sys.stderr)
+        sys.exit(2)
+    if not (args.author or args.bots_only or args.older_than or args.match):
+        print("Refusing to clean without a filter (--author/--bots-only/--older-than/--match)", file=sys.stderr)
+        sys.exit(2)
+
+    state = load_state(args.state)
+    for channel_id in channels:
+        try:
+            count = clean_channel(token, channel_id, args, state)
+        except KeyboardInterrupt:
+            print(f"\nInterrupted; progress saved to {args.state}" if args.state else "\nInterrupted")
+            sys.exit(130)
+        verb = "Would delete" if args.dry_run else "Deleted"
+        print(f"{verb} {count} message(s) in {channel_id}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])